@@ -1,4 +1,5 @@
-import os
+from collections import deque
+from pathlib import Path
 
 structure = {
     "scim_server": [
@@ -11,14 +12,35 @@ structure = {
     ]
 }
 
-def create_structure(base, items):
-    for item in items:
-        if isinstance(item, str):
-            open(os.path.join(base, item), 'w').close()
-        elif isinstance(item, dict):
-            for folder, files in item.items():
-                folder_path = os.path.join(base, folder)
-                os.makedirs(folder_path, exist_ok=True)
-                create_structure(folder_path, files)
+def walk(base, items):
+    """Yield (path, is_dir) pairs for every entry in the structure."""
+    # Explicit worklist instead of recursion: no interpreter frame per
+    # nesting level, and each directory path is joined exactly once
+    stack = deque([(base, items)])
+    while stack:
+        base, items = stack.popleft()
+        for item in items:
+            if isinstance(item, str):
+                yield base / item, False
+            elif isinstance(item, dict):
+                for folder, files in item.items():
+                    folder_path = base / folder
+                    yield folder_path, True
+                    stack.append((folder_path, files))
 
-create_structure(".", structure)
+def create_structure(base, tree):
+    paths = [(path, is_dir) for folder, items in tree.items()
+             for path, is_dir in walk(base / folder, items)]
+
+    # Create each unique directory once (including file parents), then
+    # touch the files — far fewer mkdir/stat syscalls than one
+    # makedirs+open per entry
+    dirs = {path for path, is_dir in paths if is_dir}
+    dirs.update(path.parent for path, is_dir in paths if not is_dir)
+    for directory in sorted(dirs):
+        directory.mkdir(parents=True, exist_ok=True)
+    for path, is_dir in paths:
+        if not is_dir:
+            path.touch()
+
+create_structure(Path("."), structure)
@@ -3,7 +3,6 @@ Example of creating a service principal in Microsoft Entra ID.
 """
 
 import asyncio
-import os
 from dotenv import load_dotenv
 from scim_server.services.identity import EntraIdentityManager
 
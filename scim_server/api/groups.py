@@ -2,34 +2,42 @@
 API routes for SCIM Group endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi import APIRouter, Depends, Response, status
 from typing import Optional, Dict, Any
 
 from scim_server.schemas.group import GroupSchema, GroupListResponse
 from scim_server.services.scim import SCIMService
 from scim_server.utils.auth import EntraAuth
+from scim_server.utils.orjson_response import render_async
 
-router = APIRouter(prefix="/scim/v2/Groups", tags=["Groups"])
+# Shared dependency marker so every route reuses one Depends descriptor
+_AUTH = Depends(EntraAuth.get_access_token)
+
+router = APIRouter(prefix="/Groups", tags=["Groups"])
 
 @router.get("", response_model=GroupListResponse)
 async def get_groups(
-    request: Request,
     filter: Optional[str] = None,
     startIndex: int = 1,
     count: int = 100,
-    token: str = Depends(EntraAuth.get_access_token)
+    cursor: Optional[str] = None,
+    token: str = _AUTH
 ):
     """
     Get a list of groups with optional filtering and pagination.
+    Deep pages are fetched via the opaque cursor returned as nextCursor.
     """
     scim_service = SCIMService(token)
-    return await scim_service.get_groups(filter, startIndex, count)
+    # Serialize the already-SCIM-shaped dict directly; returning a Response
+    # skips FastAPI's response_model re-validation pass on large pages, and
+    # render_async keeps the event loop free while big pages are encoded
+    result = await scim_service.get_groups(filter, startIndex, count, cursor)
+    return Response(content=await render_async(result), media_type="application/json")
 
 @router.get("/{group_id}", response_model=GroupSchema)
 async def get_group(
     group_id: str,
-    request: Request,
-    token: str = Depends(EntraAuth.get_access_token)
+    token: str = _AUTH
 ):
     """
     Get a specific group by ID.
@@ -40,34 +48,31 @@ async def get_group(
 @router.post("", response_model=GroupSchema, status_code=status.HTTP_201_CREATED)
 async def create_group(
     group: GroupSchema,
-    request: Request,
-    token: str = Depends(EntraAuth.get_access_token)
+    token: str = _AUTH
 ):
     """
     Create a new group.
     """
     scim_service = SCIMService(token)
-    return await scim_service.create_group(group.dict(exclude_unset=True))
+    return await scim_service.create_group(group.model_dump(exclude_unset=True, mode="json"))
 
 @router.put("/{group_id}", response_model=GroupSchema)
 async def replace_group(
     group_id: str,
     group: GroupSchema,
-    request: Request,
-    token: str = Depends(EntraAuth.get_access_token)
+    token: str = _AUTH
 ):
     """
     Replace a group (PUT).
     """
     scim_service = SCIMService(token)
-    return await scim_service.update_group(group_id, group.dict(exclude_unset=True))
+    return await scim_service.update_group(group_id, group.model_dump(exclude_unset=True, mode="json"))
 
 @router.patch("/{group_id}", response_model=GroupSchema)
 async def update_group(
     group_id: str,
     group: Dict[str, Any],
-    request: Request,
-    token: str = Depends(EntraAuth.get_access_token)
+    token: str = _AUTH
 ):
     """
     Update a group (PATCH).
@@ -78,8 +83,7 @@ async def update_group(
 @router.delete("/{group_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_group(
     group_id: str,
-    request: Request,
-    token: str = Depends(EntraAuth.get_access_token)
+    token: str = _AUTH
 ):
     """
     Delete a group.
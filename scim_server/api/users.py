@@ -2,34 +2,42 @@
 API routes for SCIM User endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi import APIRouter, Depends, Response, status
 from typing import Optional, Dict, Any
 
 from scim_server.schemas.user import UserSchema, UserListResponse
 from scim_server.services.scim import SCIMService
 from scim_server.utils.auth import EntraAuth
+from scim_server.utils.orjson_response import render_async
 
-router = APIRouter(prefix="/scim/v2/Users", tags=["Users"])
+# Shared dependency marker so every route reuses one Depends descriptor
+_AUTH = Depends(EntraAuth.get_access_token)
+
+router = APIRouter(prefix="/Users", tags=["Users"])
 
 @router.get("", response_model=UserListResponse)
 async def get_users(
-    request: Request,
     filter: Optional[str] = None,
     startIndex: int = 1,
     count: int = 100,
-    token: str = Depends(EntraAuth.get_access_token)
+    cursor: Optional[str] = None,
+    token: str = _AUTH
 ):
     """
     Get a list of users with optional filtering and pagination.
+    Deep pages are fetched via the opaque cursor returned as nextCursor.
     """
     scim_service = SCIMService(token)
-    return await scim_service.get_users(filter, startIndex, count)
+    # Serialize the already-SCIM-shaped dict directly; returning a Response
+    # skips FastAPI's response_model re-validation pass on large pages, and
+    # render_async keeps the event loop free while big pages are encoded
+    result = await scim_service.get_users(filter, startIndex, count, cursor)
+    return Response(content=await render_async(result), media_type="application/json")
 
 @router.get("/{user_id}", response_model=UserSchema)
 async def get_user(
     user_id: str,
-    request: Request,
-    token: str = Depends(EntraAuth.get_access_token)
+    token: str = _AUTH
 ):
     """
     Get a specific user by ID.
@@ -40,34 +48,31 @@ async def get_user(
 @router.post("", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user: UserSchema,
-    request: Request,
-    token: str = Depends(EntraAuth.get_access_token)
+    token: str = _AUTH
 ):
     """
     Create a new user.
     """
     scim_service = SCIMService(token)
-    return await scim_service.create_user(user.dict(exclude_unset=True))
+    return await scim_service.create_user(user.model_dump(exclude_unset=True, mode="json"))
 
 @router.put("/{user_id}", response_model=UserSchema)
 async def replace_user(
     user_id: str,
     user: UserSchema,
-    request: Request,
-    token: str = Depends(EntraAuth.get_access_token)
+    token: str = _AUTH
 ):
     """
     Replace a user (PUT).
     """
     scim_service = SCIMService(token)
-    return await scim_service.update_user(user_id, user.dict(exclude_unset=True))
+    return await scim_service.update_user(user_id, user.model_dump(exclude_unset=True, mode="json"))
 
 @router.patch("/{user_id}", response_model=UserSchema)
 async def update_user(
     user_id: str,
     user: Dict[str, Any],
-    request: Request,
-    token: str = Depends(EntraAuth.get_access_token)
+    token: str = _AUTH
 ):
     """
     Update a user (PATCH).
@@ -78,8 +83,7 @@ async def update_user(
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: str,
-    request: Request,
-    token: str = Depends(EntraAuth.get_access_token)
+    token: str = _AUTH
 ):
     """
     Delete a user.
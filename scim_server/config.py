@@ -1,31 +1,35 @@
-import os
-from typing import List, Optional
-from pydantic_settings import BaseSettings
+import secrets
+from typing import List
+from pydantic import Field, computed_field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
-    # Entra ID (Azure AD) configuration
-    CLIENT_ID: str = os.environ.get("CLIENT_ID", "")
-    CLIENT_SECRET: str = os.environ.get("CLIENT_SECRET", "")
-    TENANT_ID: str = os.environ.get("TENANT_ID", "")
-    AUTHORITY: Optional[str] = None
-    REDIRECT_URI: str = os.environ.get("REDIRECT_URI", "http://localhost:8000/auth/callback")
+    # Entra ID (Azure AD) configuration; values come from the environment
+    # or .env via pydantic-settings — no separate os.environ scan
+    CLIENT_ID: str = ""
+    CLIENT_SECRET: str = ""
+    TENANT_ID: str = ""
+    REDIRECT_URI: str = "http://localhost:8000/auth/callback"
     SCOPE: List[str] = ["User.Read", "User.ReadBasic.All", "Directory.Read.All"]
-    
+
     # Application settings
     APP_NAME: str = "SCIM Server"
-    SESSION_SECRET: str = os.environ.get("SESSION_SECRET", os.urandom(24).hex())
-    DEBUG: bool = os.environ.get("DEBUG", "True").lower() == "true"
-    
-    # CORS settings
-    CORS_ORIGINS: List[str] = ["*"]
-    
-    class Config:
-        env_file = ".env"
-        
-    def __init__(self, **data):
-        super().__init__(**data)
-        if self.TENANT_ID:
-            self.AUTHORITY = f"https://login.microsoftonline.com/{self.TENANT_ID}"
+    # default_factory keeps the entropy syscall off the import path when
+    # SESSION_SECRET is provided via the environment
+    SESSION_SECRET: str = Field(default_factory=lambda: secrets.token_hex(24))
+    DEBUG: bool = True
+
+    # CORS settings; empty by default since SCIM traffic is
+    # server-to-server — populate from the environment when a browser UI
+    # actually needs cross-origin access
+    CORS_ORIGINS: List[str] = []
+
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, frozen=True)
+
+    @computed_field
+    @property
+    def AUTHORITY(self) -> str:
+        return f"https://login.microsoftonline.com/{self.TENANT_ID}" if self.TENANT_ID else ""
 
 # Create settings instance
 settings = Settings()
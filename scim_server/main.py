@@ -2,31 +2,64 @@
 Main application entry point for the SCIM server.
 """
 
-from fastapi import FastAPI, Request, Depends, HTTPException, status
-from fastapi.responses import RedirectResponse, JSONResponse, HTMLResponse
+import asyncio
+import hashlib
+import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, FastAPI, Request, Response, Depends, HTTPException, status
+from fastapi.responses import RedirectResponse, HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-import msal
-import httpx
+import anyio
 import uvicorn
 import logging
 
 from scim_server.config import settings
 from scim_server.api.users import router as users_router
 from scim_server.api.groups import router as groups_router
+from scim_server.services import graph as graph_service_module
+from scim_server.services import scim as scim_service_module
+from scim_server.utils import auth as auth_module
 from scim_server.utils.auth import EntraAuth
+from scim_server.utils.orjson_response import ORJSONResponse
 
-# Set up logging configuration
-logging.basicConfig(level=logging.DEBUG)
+# Set up logging configuration; verbose logging only when DEBUG is enabled
+logging.basicConfig(level=logging.DEBUG if settings.DEBUG else logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Fixed SCIM error schema URI, hoisted so the handler does not rebuild it per call
+SCIM_ERROR_SCHEMAS = ("urn:ietf:params:scim:api:messages:2.0:Error",)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Bound the default thread pool at startup and close the shared
+    Graph API clients on shutdown.
+    """
+    # to_thread offloads (MSAL token calls) share the default executor;
+    # a bounded pool keeps a burst of logins from spawning threads
+    # without limit
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+    )
+    yield
+    await scim_service_module.close_client()
+    await graph_service_module.close_client()
+    await auth_module.close_graph_client()
+
 
 # Create FastAPI application
 app = FastAPI(
 
     title=settings.APP_NAME,
     description="SCIM server implementation using Microsoft Entra ID for identity management",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add session middleware for authentication
@@ -39,18 +72,62 @@ app.add_middleware(
     https_only=False                    # Set to True in production with HTTPS
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# Add CORS middleware only when browser origins are configured, so pure
+# server-to-server SCIM traffic skips the CORS header machinery entirely
+if settings.CORS_ORIGINS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
+        allow_headers=["*"],
+    )
+
+# Mount the SCIM routers under one parent so the prefix and the access
+# token dependency are declared a single time; FastAPI's per-request
+# dependency cache resolves the shared dependency once per call
+scim_router = APIRouter(
+    prefix="/scim/v2",
+    dependencies=[Depends(EntraAuth.get_access_token)]
 )
+scim_router.include_router(users_router)
+scim_router.include_router(groups_router)
+app.include_router(scim_router)
 
-# Include API routers
-app.include_router(users_router)
-app.include_router(groups_router)
+# ETags on SCIM list responses let polling clients skip the body bytes
+# on repeat reads. The comparison runs only after the route — and its
+# session-auth dependency — has executed, so a 304 is never served to a
+# request that would not have been allowed the 200.
+
+@app.middleware("http")
+async def scim_etag_middleware(request: Request, call_next):
+    """
+    Emit ETags on SCIM list responses and answer repeat polls with 304.
+    """
+    if request.method != "GET" or not request.url.path.startswith(
+        ("/scim/v2/Users", "/scim/v2/Groups")
+    ):
+        return await call_next(request)
+
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+
+    # Drain the streamed body so the ETag covers the exact bytes sent
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    headers = dict(response.headers)
+    headers["ETag"] = etag
+    return Response(
+        content=body,
+        status_code=response.status_code,
+        headers=headers,
+        media_type=response.media_type
+    )
 
 # Authentication routes
 @app.get("/login")
@@ -59,7 +136,7 @@ async def login():
     Redirect to Microsoft Entra ID login page.
     """
     auth_url = EntraAuth.get_auth_url()
-    logger.debug(f"Redirecting to auth URL: {auth_url}")
+    logger.debug("Redirecting to auth URL: %s", auth_url)
     
     # Use direct RedirectResponse for the login page
     # This is a simple external redirect that doesn't need to set cookies
@@ -71,40 +148,33 @@ async def auth_callback(request: Request, code: str):
     """
     Handle the Microsoft Entra ID authentication callback.
     """
-    logger.debug(f"Auth callback received with code: {code[:10]}...")
-    
     try:
-        # Get token from code
-        logger.debug("Attempting to exchange code for token...")
-        token_result = await EntraAuth.get_token_from_code(code)
-        
+        # Exchange the code for a token while warming up the Graph
+        # connection used by get_user_info a few lines later; the warm-up
+        # overlaps its TLS handshake with the token round trip
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(EntraAuth.warm_graph_connection)
+            token_result = await EntraAuth.get_token_from_code(code)
+
         if "error" in token_result:
-            logger.error(f"Error in token response: {token_result.get('error')}")
-            logger.error(f"Error description: {token_result.get('error_description')}")
-            return JSONResponse(
+            logger.error("Error in token response: %s", token_result.get('error'))
+            logger.error("Error description: %s", token_result.get('error_description'))
+            return ORJSONResponse(
                 status_code=401,
                 content={"error": "Authentication failed", "details": token_result.get("error_description")}
             )
         
-        logger.debug("Token exchange successful")
-        logger.debug(f"Access token starts with: {token_result.get('access_token', '')[:10]}...")
-        logger.debug(f"Token type: {token_result.get('token_type')}")
-        logger.debug(f"Expires in: {token_result.get('expires_in')} seconds")
-        
         # Get user info
-        logger.debug("Attempting to retrieve user info from Graph API...")
         try:
             user_info = await EntraAuth.get_user_info(token_result["access_token"])
-            logger.debug(f"User info retrieved: {user_info.get('displayName')} ({user_info.get('userPrincipalName')})")
         except Exception as e:
-            logger.error(f"Error retrieving user info: {str(e)}")
-            return JSONResponse(
+            logger.error("Error retrieving user info: %s", str(e))
+            return ORJSONResponse(
                 status_code=401,
                 content={"error": "Failed to retrieve user information"}
             )
         
         # Store in session
-        logger.debug("Storing token and user info in session...")
         request.session["token"] = {
             "access_token": token_result["access_token"],
             "expires_in": token_result.get("expires_in"),
@@ -116,43 +186,13 @@ async def auth_callback(request: Request, code: str):
             "userPrincipalName": user_info.get("userPrincipalName")
         }
 
-       # Force the session to be saved
-        request.scope["session"] = request.session
-        request.scope["session"].update({})  # Force a modification to ensure saving
- 
-
         # Create a redirect response
-        response = RedirectResponse(url="/", status_code=302)
-        
-        
-        # Check if session was actually set
-        logger.debug(f"Session contains token: {'token' in request.session }")
-        logger.debug(f"Session contains user: {'user' in request.session}")
-        
-        # Log the response headers for debugging
-        logger.debug("Response headers will be:")
-        for header, value in response.headers.items():
-            logger.debug(f"  {header}: {value}")
-        
-        
-        # Log session size for debugging
-        import json
-        session_data = json.dumps(dict(request.session))
-        logger.debug(f"Session data size: {len(session_data)} bytes")
-        
-        
-        
-      
-        
-        logger.debug("Redirecting to home page...")
-        
-        return response
+        return RedirectResponse(url="/", status_code=302)
         
     except Exception as e:
-        logger.error(f"Unexpected error in auth callback: {str(e)}")
-        import traceback
+        logger.error("Unexpected error in auth callback: %s", str(e))
         logger.error(traceback.format_exc())
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": "Internal server error during authentication"}
         )
@@ -165,21 +205,21 @@ async def logout(request: Request):
     request.session.clear()
     return RedirectResponse("/")
 
-# Debug routes
-@app.get("/test-login")
+# Debug routes, grouped on their own router and only mounted when DEBUG
+# is enabled, so production builds never expose them
+_debug_router = APIRouter()
+
+@_debug_router.get("/test-login")
 async def test_login(request: Request):
     """
     Test endpoint that sets session without redirect.
     This is useful for testing if the session middleware is working correctly.
     """
-    # Set some test data in the session
+    # Set some test data in the session; SessionMiddleware persists the
+    # cookie on any dict mutation, no force-save needed
     request.session["test_user"] = {"name": "Test User", "role": "tester"}
     request.session["test_time"] = str(logging.Formatter().converter())
-    
-    # Force the session to be saved
-    request.scope["session"] = request.session
-    request.scope["session"].update({})  # Force a modification to ensure saving
-    
+
     # Log what we're doing
     logger.debug("Setting test session data in /test-login endpoint")
     logger.debug(f"Session contains test_user: {'test_user' in request.session}")
@@ -191,7 +231,7 @@ async def test_login(request: Request):
         "session_keys": list(request.session.keys())
     }
 
-@app.get("/debug-cookies")
+@_debug_router.get("/debug-cookies")
 async def debug_cookies(request: Request):
     """
     Debug endpoint to check all cookies and set a test cookie.
@@ -200,7 +240,7 @@ async def debug_cookies(request: Request):
     all_cookies = request.cookies
     
     # Create a response with a test cookie
-    response = JSONResponse({
+    response = ORJSONResponse({
         "all_cookies": {k: "Present" for k in all_cookies.keys()},
         "cookie_count": len(all_cookies),
         "request_headers": {k: v for k, v in request.headers.items()},
@@ -219,7 +259,7 @@ async def debug_cookies(request: Request):
     
     return response
 
-@app.get("/debug-session")
+@_debug_router.get("/debug-session")
 async def debug_session(request: Request):
     """
     Debug endpoint to check session status.
@@ -250,6 +290,9 @@ async def debug_session(request: Request):
         "token_in_session": token_in_session
     }
 
+if settings.DEBUG:
+    app.include_router(_debug_router)
+
 # Main routes
 @app.get("/")
 async def root(user: dict = Depends(EntraAuth.get_current_user)):
@@ -278,14 +321,24 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     """
     Custom exception handler for HTTP exceptions.
     """
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
-            "schemas": ["urn:ietf:params:scim:api:messages:2.0:Error"],
+            "schemas": SCIM_ERROR_SCHEMAS,
             "status": str(exc.status_code),
             "detail": exc.detail
         }
     )
 
 if __name__ == "__main__":
-    uvicorn.run("scim_server.main:app", host="0.0.0.0", port=8000, reload=settings.DEBUG)
+    # uvloop and httptools replace the pure-Python event loop and HTTP
+    # parser; naming them explicitly hard-requires the uvicorn[standard]
+    # extras pinned in requirements rather than falling back silently
+    uvicorn.run(
+        "scim_server.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        reload=settings.DEBUG
+    )
@@ -9,37 +9,63 @@ map between Graph API responses and SCIM models.
 from dataclasses import dataclass
 from typing import Dict, Any, List, Optional
 
-@dataclass
+# Hoisted so every emitted resource reuses one frozen tuple instead of
+# allocating a fresh list per record
+_APPLICATION_SCHEMAS = ("urn:ietf:params:scim:schemas:extension:entra:2.0:Application",)
+
+@dataclass(slots=True, frozen=True)
 class EntraApplicationMapping:
     """
     A utility class to map between Microsoft Graph API application responses and SCIM-like models.
     """
     graph_application: Dict[str, Any]
+
+    # Graph fields the SCIM mapping actually reads; used as a $select
+    # projection so Graph omits everything else from the wire
+    GRAPH_SELECT_FIELDS = (
+        "id", "appId", "displayName", "description", "identifierUris",
+        "web", "signInAudience", "publisherDomain", "createdDateTime",
+        "disabledByMicrosoftStatus", "requiredResourceAccess"
+    )
     
     def to_scim_dict(self) -> Dict[str, Any]:
         """Convert a Microsoft Graph application to SCIM-like dictionary"""
+        return self.map_to_scim(self.graph_application)
+
+    @classmethod
+    def bulk_to_scim(cls, graph_applications: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert a batch of Graph applications to SCIM-like dictionaries in
+        one pass, without constructing a mapping instance per record"""
+        map_to_scim = cls.map_to_scim
+        return [map_to_scim(app) for app in graph_applications]
+
+    @staticmethod
+    def map_to_scim(g: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a single Graph application dict to a SCIM-like dictionary"""
+        web = g.get("web", {})
+
         # Basic application properties
         scim_app = {
-            "schemas": ["urn:ietf:params:scim:schemas:extension:entra:2.0:Application"],
-            "id": self.graph_application.get("id"),
-            "displayName": self.graph_application.get("displayName"),
-            "appId": self.graph_application.get("appId"),
-            "description": self.graph_application.get("description"),
-            "identifierUris": self.graph_application.get("identifierUris", []),
+            "schemas": _APPLICATION_SCHEMAS,
+            "id": g.get("id"),
+            "displayName": g.get("displayName"),
+            "appId": g.get("appId"),
+            "description": g.get("description"),
+            "identifierUris": g.get("identifierUris", []),
             "web": {
-                "redirectUris": self.graph_application.get("web", {}).get("redirectUris", []),
-                "implicitGrantSettings": self.graph_application.get("web", {}).get("implicitGrantSettings", {})
+                "redirectUris": web.get("redirectUris", []),
+                "implicitGrantSettings": web.get("implicitGrantSettings", {})
             },
-            "signInAudience": self.graph_application.get("signInAudience"),
-            "publisherDomain": self.graph_application.get("publisherDomain"),
-            "createdDateTime": self.graph_application.get("createdDateTime"),
-            "isEnabled": not self.graph_application.get("disabledByMicrosoftStatus", False)
+            "signInAudience": g.get("signInAudience"),
+            "publisherDomain": g.get("publisherDomain"),
+            "createdDateTime": g.get("createdDateTime"),
+            "isEnabled": not g.get("disabledByMicrosoftStatus", False)
         }
-        
+
         # Add required resource access if present
-        if "requiredResourceAccess" in self.graph_application:
-            scim_app["requiredResourceAccess"] = self.graph_application["requiredResourceAccess"]
-            
+        if "requiredResourceAccess" in g:
+            scim_app["requiredResourceAccess"] = g["requiredResourceAccess"]
+
         return scim_app
         
     @staticmethod
@@ -10,33 +10,49 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-@dataclass
+# Hoisted so every emitted resource reuses one frozen tuple instead of
+# allocating a fresh list per record
+_GROUP_SCHEMAS = ("urn:ietf:params:scim:schemas:core:2.0:Group",)
+
+@dataclass(slots=True, frozen=True)
 class EntraGroupMapping:
     """
     A utility class to map between Microsoft Graph API group responses and SCIM group models.
     """
     graph_group: Dict[str, Any]
+
+    # Graph fields the SCIM mapping actually reads; used as a $select
+    # projection so Graph omits everything else from the wire
+    GRAPH_SELECT_FIELDS = ("id", "displayName")
     
     def to_scim_dict(self) -> Dict[str, Any]:
         """Convert a Microsoft Graph group to SCIM group dictionary"""
+        return self.map_to_scim(self.graph_group)
+
+    @classmethod
+    def bulk_to_scim(cls, graph_groups: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert a batch of Graph groups to SCIM dictionaries in one pass,
+        without constructing a mapping instance per record"""
+        map_to_scim = cls.map_to_scim
+        return [map_to_scim(group) for group in graph_groups]
+
+    @staticmethod
+    def map_to_scim(g: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a single Graph group dict to a SCIM group dictionary"""
         # Construct the SCIM group
         scim_group = {
-            "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Group"],
-            "id": self.graph_group.get("id"),
-            "displayName": self.graph_group.get("displayName"),
+            "schemas": _GROUP_SCHEMAS,
+            "id": g.get("id"),
+            "displayName": g.get("displayName"),
         }
-        
-        # Handle members if present in the graph response
-        if "members@odata.bind" in self.graph_group:
-            members = []
-            for member_url in self.graph_group["members@odata.bind"]:
-                # Extract user ID from directory object URL
-                user_id = member_url.split("/")[-1]
-                members.append({"value": user_id})
-            
-            if members:
-                scim_group["members"] = members
-                
+
+        # Handle members if present in the graph response; the member ID is
+        # the last segment of the directory object URL. rpartition avoids
+        # building the full segment list that split would allocate per URL
+        member_urls = g.get("members@odata.bind")
+        if member_urls:
+            scim_group["members"] = [{"value": url.rpartition("/")[2]} for url in member_urls]
+
         return scim_group
     
     @staticmethod
@@ -46,14 +62,13 @@ class EntraGroupMapping:
             "displayName": scim_group.get("displayName", "")
         }
         
-        # Handle members
-        if scim_group.get("members"):
-            members = []
-            for member in scim_group.get("members"):
-                if member.get("value"):
-                    members.append(f"https://graph.microsoft.com/v1.0/directoryObjects/{member.get('value')}")
-            
-            if members:
-                graph_group["members@odata.bind"] = members
-        
+        # Handle members in a single pass, skipping entries without a value
+        members = [
+            "https://graph.microsoft.com/v1.0/directoryObjects/" + member["value"]
+            for member in scim_group.get("members") or []
+            if member.get("value")
+        ]
+        if members:
+            graph_group["members@odata.bind"] = members
+
         return graph_group
@@ -9,41 +9,68 @@ map between Graph API responses and SCIM models.
 from dataclasses import dataclass
 from typing import Dict, Any, List, Optional
 
-@dataclass
+# Hoisted so every emitted resource reuses one frozen tuple instead of
+# allocating a fresh list per record
+_SERVICE_PRINCIPAL_SCHEMAS = ("urn:ietf:params:scim:schemas:extension:entra:2.0:ServicePrincipal",)
+
+@dataclass(slots=True, frozen=True)
 class EntraServicePrincipalMapping:
     """
     A utility class to map between Microsoft Graph API service principal responses and SCIM-like models.
     """
     graph_sp: Dict[str, Any]
+
+    # Graph fields the SCIM mapping actually reads; used as a $select
+    # projection so Graph omits everything else from the wire
+    GRAPH_SELECT_FIELDS = (
+        "id", "displayName", "appId", "description", "servicePrincipalType",
+        "appOwnerOrganizationId", "appRoleAssignmentRequired", "homepage",
+        "logoutUrl", "replyUrls", "tags", "accountEnabled", "createdDateTime",
+        "appRoles", "oauth2PermissionScopes"
+    )
     
     def to_scim_dict(self) -> Dict[str, Any]:
         """Convert a Microsoft Graph service principal to SCIM-like dictionary"""
+        return self.map_to_scim(self.graph_sp)
+
+    @classmethod
+    def bulk_to_scim(cls, graph_sps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert a batch of Graph service principals to SCIM-like
+        dictionaries in one pass, without constructing a mapping instance
+        per record"""
+        map_to_scim = cls.map_to_scim
+        return [map_to_scim(sp) for sp in graph_sps]
+
+    @staticmethod
+    def map_to_scim(g: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a single Graph service principal dict to a SCIM-like dictionary"""
+
         # Basic service principal properties
         scim_sp = {
-            "schemas": ["urn:ietf:params:scim:schemas:extension:entra:2.0:ServicePrincipal"],
-            "id": self.graph_sp.get("id"),
-            "displayName": self.graph_sp.get("displayName"),
-            "appId": self.graph_sp.get("appId"),
-            "description": self.graph_sp.get("description"),
-            "servicePrincipalType": self.graph_sp.get("servicePrincipalType"),
-            "appOwnerOrganizationId": self.graph_sp.get("appOwnerOrganizationId"),
-            "appRoleAssignmentRequired": self.graph_sp.get("appRoleAssignmentRequired", False),
-            "homepage": self.graph_sp.get("homepage"),
-            "logoutUrl": self.graph_sp.get("logoutUrl"),
-            "replyUrls": self.graph_sp.get("replyUrls", []),
-            "tags": self.graph_sp.get("tags", []),
-            "accountEnabled": self.graph_sp.get("accountEnabled", True),
-            "createdDateTime": self.graph_sp.get("createdDateTime")
+            "schemas": _SERVICE_PRINCIPAL_SCHEMAS,
+            "id": g.get("id"),
+            "displayName": g.get("displayName"),
+            "appId": g.get("appId"),
+            "description": g.get("description"),
+            "servicePrincipalType": g.get("servicePrincipalType"),
+            "appOwnerOrganizationId": g.get("appOwnerOrganizationId"),
+            "appRoleAssignmentRequired": g.get("appRoleAssignmentRequired", False),
+            "homepage": g.get("homepage"),
+            "logoutUrl": g.get("logoutUrl"),
+            "replyUrls": g.get("replyUrls", []),
+            "tags": g.get("tags", []),
+            "accountEnabled": g.get("accountEnabled", True),
+            "createdDateTime": g.get("createdDateTime")
         }
-        
+
         # Add app roles if present
-        if "appRoles" in self.graph_sp:
-            scim_sp["appRoles"] = self.graph_sp["appRoles"]
-            
+        if "appRoles" in g:
+            scim_sp["appRoles"] = g["appRoles"]
+
         # Add oauth2 permissions if present
-        if "oauth2PermissionScopes" in self.graph_sp:
-            scim_sp["oauth2PermissionScopes"] = self.graph_sp["oauth2PermissionScopes"]
-            
+        if "oauth2PermissionScopes" in g:
+            scim_sp["oauth2PermissionScopes"] = g["oauth2PermissionScopes"]
+
         return scim_sp
         
     @staticmethod
@@ -10,54 +10,79 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-@dataclass
+# Hoisted so every emitted resource reuses one frozen tuple instead of
+# allocating a fresh list per record
+_USER_SCHEMAS = ("urn:ietf:params:scim:schemas:core:2.0:User",)
+
+@dataclass(slots=True, frozen=True)
 class EntraUserMapping:
     """
     A utility class to map between Microsoft Graph API user responses and SCIM user models.
     """
     graph_user: Dict[str, Any]
+
+    # Graph fields the SCIM mapping actually reads; used as a $select
+    # projection so Graph omits everything else from the wire
+    GRAPH_SELECT_FIELDS = (
+        "id", "userPrincipalName", "displayName", "givenName", "surname",
+        "accountEnabled", "mail", "businessPhones"
+    )
     
     def to_scim_dict(self) -> Dict[str, Any]:
         """Convert a Microsoft Graph user to SCIM user dictionary"""
-        name = {
-            "formatted": f"{self.graph_user.get('givenName', '')} {self.graph_user.get('surname', '')}".strip(),
-            "familyName": self.graph_user.get("surname"),
-            "givenName": self.graph_user.get("givenName")
-        }
-        
-        emails = []
-        if self.graph_user.get("mail"):
-            emails.append({
-                "value": self.graph_user.get("mail"),
-                "type": "work",
-                "primary": True
-            })
-        
-        phone_numbers = []
-        if self.graph_user.get("businessPhones"):
-            for phone in self.graph_user.get("businessPhones"):
-                phone_numbers.append({
-                    "value": phone,
-                    "type": "work"
-                })
-        
+        return self.map_to_scim(self.graph_user)
+
+    @classmethod
+    def bulk_to_scim(cls, graph_users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert a batch of Graph users to SCIM dictionaries in one pass,
+        without constructing a mapping instance per record"""
+        map_to_scim = cls.map_to_scim
+        return [map_to_scim(user) for user in graph_users]
+
+    @staticmethod
+    def map_to_scim(g: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a single Graph user dict to a SCIM user dictionary"""
+        # Bind the repeated sub-lookups once; this function runs per user
+        # on every list page
+        upn = g.get("userPrincipalName")
+
         # Construct the SCIM user
         scim_user = {
-            "schemas": ["urn:ietf:params:scim:schemas:core:2.0:User"],
-            "id": self.graph_user.get("id"),
-            "externalId": self.graph_user.get("userPrincipalName"),
-            "userName": self.graph_user.get("userPrincipalName"),
-            "name": name,
-            "displayName": self.graph_user.get("displayName"),
-            "active": self.graph_user.get("accountEnabled", True)
+            "schemas": _USER_SCHEMAS,
+            "id": g.get("id"),
+            "externalId": upn,
+            "userName": upn,
+            "displayName": g.get("displayName"),
+            "active": g.get("accountEnabled", True)
         }
-        
-        if emails:
-            scim_user["emails"] = emails
-            
-        if phone_numbers:
-            scim_user["phoneNumbers"] = phone_numbers
-            
+
+        # Only build the name sub-object when a component exists; plain
+        # concatenation avoids interpolating and stripping empty strings
+        gn = g.get("givenName")
+        sn = g.get("surname")
+        if gn or sn:
+            if gn and sn:
+                formatted = gn + " " + sn
+            else:
+                formatted = gn or sn
+            scim_user["name"] = {
+                "formatted": formatted,
+                "familyName": sn,
+                "givenName": gn
+            }
+
+        mail = g.get("mail")
+        if mail:
+            scim_user["emails"] = [{
+                "value": mail,
+                "type": "work",
+                "primary": True
+            }]
+
+        phones = g.get("businessPhones")
+        if phones:
+            scim_user["phoneNumbers"] = [{"value": phone, "type": "work"} for phone in phones]
+
         return scim_user
     
     @staticmethod
@@ -1,5 +1,5 @@
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 class Meta(BaseModel):
@@ -13,18 +13,23 @@ class Member(BaseModel):
     value: str
     display: Optional[str] = None
     type: Optional[str] = None
-    ref: Optional[str] = None
+    # SCIM names this attribute $ref on the wire, which is not a valid
+    # Python identifier; the alias keeps the JSON key while the model
+    # stays addressable as .ref
+    ref: Optional[str] = Field(None, alias="$ref")
+
+    model_config = ConfigDict(populate_by_name=True)
 
 class GroupSchema(BaseModel):
-    schemas: List[str] = ["urn:ietf:params:scim:schemas:core:2.0:Group"]
+    schemas: Tuple[str, ...] = ("urn:ietf:params:scim:schemas:core:2.0:Group",)
     id: Optional[str] = None
     externalId: Optional[str] = None
     meta: Optional[Meta] = None
     displayName: str
     members: Optional[List[Member]] = None
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Group"],
                 "id": "e9e30dba-f08f-4109-8486-d5c6a331660a",
@@ -37,10 +42,12 @@ class GroupSchema(BaseModel):
                 ]
             }
         }
+    )
 
 class GroupListResponse(BaseModel):
-    schemas: List[str] = ["urn:ietf:params:scim:api:messages:2.0:ListResponse"]
+    schemas: Tuple[str, ...] = ("urn:ietf:params:scim:api:messages:2.0:ListResponse",)
     totalResults: int
     startIndex: int = 1
     itemsPerPage: int = 100
+    nextCursor: Optional[str] = None
     Resources: List[GroupSchema]
@@ -1,5 +1,5 @@
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 class Meta(BaseModel):
@@ -40,7 +40,7 @@ class Address(BaseModel):
     primary: Optional[bool] = None
 
 class UserSchema(BaseModel):
-    schemas: List[str] = ["urn:ietf:params:scim:schemas:core:2.0:User"]
+    schemas: Tuple[str, ...] = ("urn:ietf:params:scim:schemas:core:2.0:User",)
     id: Optional[str] = None
     externalId: Optional[str] = None
     meta: Optional[Meta] = None
@@ -59,8 +59,8 @@ class UserSchema(BaseModel):
     phoneNumbers: Optional[List[PhoneNumber]] = None
     addresses: Optional[List[Address]] = None
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "schemas": ["urn:ietf:params:scim:schemas:core:2.0:User"],
                 "id": "2819c223-7f76-453a-919d-413861904646",
@@ -82,10 +82,12 @@ class UserSchema(BaseModel):
                 "active": True
             }
         }
+    )
 
 class UserListResponse(BaseModel):
-    schemas: List[str] = ["urn:ietf:params:scim:api:messages:2.0:ListResponse"]
+    schemas: Tuple[str, ...] = ("urn:ietf:params:scim:api:messages:2.0:ListResponse",)
     totalResults: int
     startIndex: int = 1
     itemsPerPage: int = 100
+    nextCursor: Optional[str] = None
     Resources: List[UserSchema]
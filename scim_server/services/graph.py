@@ -2,7 +2,11 @@
 Extended service for interacting with Microsoft Graph API.
 """
 
+import secrets
+from collections import OrderedDict
+
 import httpx
+import orjson
 from typing import Dict, List, Optional, Any
 from fastapi import HTTPException, status
 
@@ -10,7 +14,100 @@ from scim_server.models.user import EntraUserMapping
 from scim_server.models.group import EntraGroupMapping
 from scim_server.models.application import EntraApplicationMapping
 from scim_server.models.service_principal import EntraServicePrincipalMapping
+from scim_server.utils.cache import TTLCache
 from scim_server.utils.filtering import SCIMFilter
+from scim_server.utils.streaming import parse_collection
+
+# Thin alias so the JSON codec stays swappable in one place
+_json_loads = orjson.loads
+
+# Shared connection pool for Graph API calls, mirroring the SCIM service
+# client. One pooled client keeps connections alive across requests
+# instead of paying DNS+TCP+TLS setup per call. HTTP/2 lets concurrent
+# operations multiplex over one TLS connection instead of queueing.
+_CLIENT = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    timeout=30
+)
+
+# Bound-method jump table replacing the if/elif method chain; the flag
+# marks verbs that carry a JSON body. PUT maps to PATCH, matching the
+# partial-update semantics Graph expects.
+_DISPATCH = {
+    "GET": (_CLIENT.get, False),
+    "POST": (_CLIENT.post, True),
+    "PUT": (_CLIENT.patch, True),
+    "PATCH": (_CLIENT.patch, True),
+    "DELETE": (_CLIENT.delete, False),
+}
+
+# Graph collection endpoints hoisted to constants; item URLs are built
+# with plain concatenation rather than per-call f-string formatting
+USERS_EP = "/users"
+GROUPS_EP = "/groups"
+APPLICATIONS_EP = "/applications"
+SERVICE_PRINCIPALS_EP = "/servicePrincipals"
+
+# Prefix guarantees the generated temp password satisfies Graph's
+# complexity policy regardless of what token_urlsafe produces
+_TEMP_PASSWORD_PREFIX = "Tmp!"
+
+# Asks Graph to include the updated entity in the PATCH response so
+# update operations need no follow-up GET
+_PREFER_REPRESENTATION = {"Prefer": "return=representation"}
+
+# Graph requires this header for $count on directory objects
+_CONSISTENCY_EVENTUAL = {"ConsistencyLevel": "eventual"}
+
+# Recently seen @odata.nextLink cursors, keyed by the page that follows
+# them. Graph implements $skip as an O(N) scan on many collections while
+# nextLink carries a server-side cursor, so deep pages reached through a
+# cached link avoid the scan entirely.
+_NEXTLINK_CACHE: OrderedDict = OrderedDict()
+_NEXTLINK_CACHE_MAX = 256
+
+def _remember_next_link(key, link: Optional[str]):
+    """
+    Store a nextLink cursor, evicting the least recently used entry.
+    """
+    if not link:
+        return
+    _NEXTLINK_CACHE[key] = link
+    _NEXTLINK_CACHE.move_to_end(key)
+    if len(_NEXTLINK_CACHE) > _NEXTLINK_CACHE_MAX:
+        _NEXTLINK_CACHE.popitem(last=False)
+
+# Graph's maximum $top for directory resources. Windows beyond this
+# cannot be fanned out with $skip — directory endpoints page only via
+# $skiptoken/nextLink — so a single capped request is the best one call
+# can do; callers continue through the cursor for the rest.
+_TOP_MAX = 999
+
+# Single-entity reads served from cache for a few seconds; provisioning
+# clients habitually re-read an entity right after writing it
+_ENTITY_CACHE = TTLCache(ttl=5, max_size=2048)
+
+async def close_client():
+    """
+    Close the shared Graph API client. Called at application shutdown.
+    """
+    await _CLIENT.aclose()
+
+def _error_message(response: httpx.Response) -> str:
+    """
+    Extract the Graph error message from a failed response.
+
+    Only attempts a JSON decode when the Content-Type says the body is
+    JSON, so HTML throttling pages skip the parse entirely, and catches
+    only decode errors rather than masking unrelated bugs.
+    """
+    if response.headers.get("content-type", "").startswith("application/json"):
+        try:
+            return _json_loads(response.content).get("error", {}).get("message", "Unknown error")
+        except orjson.JSONDecodeError:
+            pass
+    return response.text or "Unknown error"
 
 class EntraGraphService:
     """
@@ -22,81 +119,148 @@ class EntraGraphService:
         Initialize with Microsoft Graph API access token.
         """
         self.access_token = access_token
-        self.headers = {
+        # Pre-encoded httpx.Headers lets the client reuse the encoded
+        # header block on every call instead of re-encoding a plain dict
+        self.headers = httpx.Headers({
             "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json"
-        }
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        })
         self.graph_api_base = "https://graph.microsoft.com/v1.0"
     
-    async def _make_request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None):
+    async def _make_request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None,
+                            extra_headers: Optional[Dict[str, str]] = None,
+                            params: Optional[Dict[str, Any]] = None):
         """
         Make a request to Microsoft Graph API.
         """
-        url = f"{self.graph_api_base}{endpoint}"
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                if method.lower() == "get":
-                    response = await client.get(url, headers=self.headers)
-                elif method.lower() == "post":
-                    response = await client.post(url, headers=self.headers, json=data)
-                elif method.lower() == "put" or method.lower() == "patch":
-                    response = await client.patch(url, headers=self.headers, json=data)
-                elif method.lower() == "delete":
-                    response = await client.delete(url, headers=self.headers)
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-                    
+        # nextLink continuation URLs from Graph are already absolute
+        url = endpoint if endpoint.startswith("https://") else f"{self.graph_api_base}{endpoint}"
+
+        if extra_headers:
+            headers = httpx.Headers(self.headers)
+            headers.update(extra_headers)
+        else:
+            headers = self.headers
+
+        dispatch = _DISPATCH.get(method.upper())
+        if dispatch is None:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        request_fn, sends_body = dispatch
+
+        try:
+            if sends_body:
+                response = await request_fn(url, headers=headers, json=data, params=params)
+            else:
+                response = await request_fn(url, headers=headers, params=params)
+
+            if response.status_code >= 400:
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail=f"Graph API error: {_error_message(response)}"
+                )
+
+            return response
+        except httpx.RequestError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Error connecting to Graph API: {str(e)}"
+            )
+    
+    async def _stream_collection(self, endpoint: str,
+                                 params: Optional[Dict[str, Any]] = None,
+                                 extra_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        GET a collection endpoint and decode it incrementally.
+
+        Large enumeration pages are parsed entity by entity through
+        ijson instead of materializing the whole response body before
+        decoding, keeping peak memory at one record.
+        """
+        url = endpoint if endpoint.startswith("https://") else f"{self.graph_api_base}{endpoint}"
+
+        if extra_headers:
+            headers = httpx.Headers(self.headers)
+            headers.update(extra_headers)
+        else:
+            headers = self.headers
+
+        try:
+            async with _CLIENT.stream("GET", url, headers=headers, params=params) as response:
                 if response.status_code >= 400:
-                    try:
-                        error_data = response.json()
-                        error_message = error_data.get("error", {}).get("message", "Unknown error")
-                    except:
-                        error_message = response.text or "Unknown error"
-                        
+                    await response.aread()
                     raise HTTPException(
                         status_code=response.status_code,
-                        detail=f"Graph API error: {error_message}"
+                        detail=f"Graph API error: {_error_message(response)}"
                     )
-                    
-                return response
-            except httpx.RequestError as e:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail=f"Error connecting to Graph API: {str(e)}"
-                )
-    
-    async def _paginated_request(self, endpoint: str, start_index: int = 1, count: int = 100, filter_str: Optional[str] = None):
+
+                return await parse_collection(response.aiter_bytes())
+        except httpx.RequestError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Error connecting to Graph API: {str(e)}"
+            )
+
+    async def batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute up to 20 Graph operations in a single /$batch round trip.
+
+        Each entry follows the Graph JSON batching schema (id, method,
+        url, and optional body/headers/dependsOn). Responses come back
+        in request order regardless of how Graph interleaved them.
+        """
+        response = await self._make_request("post", "/$batch", {"requests": requests})
+        responses = _json_loads(response.content).get("responses", [])
+
+        order = {str(req["id"]): position for position, req in enumerate(requests)}
+        responses.sort(key=lambda item: order.get(str(item.get("id")), len(order)))
+        return responses
+
+    async def _paginated_request(self, endpoint: str, start_index: int = 1, count: int = 100, filter_str: Optional[str] = None,
+                                 select_fields: Optional[tuple] = None):
         """
         Make a paginated request to Microsoft Graph API.
         """
-        # Calculate skip based on start_index (SCIM is 1-based, Graph API is 0-based)
-        skip = start_index - 1 if start_index > 1 else 0
-        
-        # Build query parameters
-        params = []
-        if filter_str:
-            params.append(f"$filter={filter_str}")
-        if skip > 0:
-            params.append(f"$skip={skip}")
-        params.append(f"$top={count}")
-        params.append("$count=true")  # Request total count
-        
-        # Build query string
-        query = "?" + "&".join(params) if params else ""
-        
-        # Make request
-        response = await self._make_request("get", f"{endpoint}{query}")
-        result = response.json()
-        
+        # Prefer a cached server-side cursor for deep pages over $skip
+        cache_key = (endpoint, filter_str, count, start_index)
+        next_link = _NEXTLINK_CACHE.get(cache_key) if start_index > 1 else None
+
+        if next_link is not None:
+            _NEXTLINK_CACHE.move_to_end(cache_key)
+            result = await self._stream_collection(next_link)
+        else:
+            # Calculate skip based on start_index (SCIM is 1-based, Graph API is 0-based)
+            skip = start_index - 1 if start_index > 1 else 0
+
+            # Build query parameters as a dict; httpx encodes the query
+            # string once instead of hand-joined f-strings
+            params = {"$top": min(count, _TOP_MAX), "$count": "true"}
+            if filter_str:
+                params["$filter"] = filter_str
+            if skip > 0:
+                params["$skip"] = skip
+            if select_fields:
+                params["$select"] = ",".join(select_fields)
+
+            # Make request; $count=true needs the eventual-consistency
+            # header on directory objects
+            result = await self._stream_collection(endpoint, params=params,
+                                                   extra_headers=_CONSISTENCY_EVENTUAL)
+
+        # Remember the cursor that leads to the page after this one
+        _remember_next_link(
+            (endpoint, filter_str, count, start_index + count),
+            result.get("@odata.nextLink")
+        )
+
         # Get total count if available
         total_count = result.get("@odata.count", len(result.get("value", [])))
-        
+
         return {
             "value": result.get("value", []),
             "totalCount": total_count
         }
-    
+
     # User-related operations
     
     async def get_users(self, filter_str: Optional[str] = None, start_index: int = 1, count: int = 100):
@@ -107,12 +271,13 @@ class EntraGraphService:
         graph_filter = SCIMFilter.convert_to_graph_filter(filter_str) if filter_str else None
         
         # Make paginated request
-        result = await self._paginated_request("/users", start_index, count, graph_filter)
+        result = await self._paginated_request(USERS_EP, start_index, count, graph_filter,
+                                               select_fields=EntraUserMapping.GRAPH_SELECT_FIELDS)
         graph_users = result["value"]
         total_count = result["totalCount"]
         
         # Convert to SCIM format
-        scim_users = [EntraUserMapping(user).to_scim_dict() for user in graph_users]
+        scim_users = EntraUserMapping.bulk_to_scim(graph_users)
         
         return {
             "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
@@ -126,10 +291,22 @@ class EntraGraphService:
         """
         Get a specific user from Microsoft Entra ID.
         """
-        response = await self._make_request("get", f"/users/{user_id}")
-        graph_user = response.json()
-        
-        return EntraUserMapping(graph_user).to_scim_dict()
+        cache_key = (USERS_EP, user_id)
+        cached = _ENTITY_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Per-key lock so concurrent misses fetch once
+        async with _ENTITY_CACHE.get_lock(cache_key):
+            cached = _ENTITY_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+
+            select = "$select=" + ",".join(EntraUserMapping.GRAPH_SELECT_FIELDS)
+            response = await self._make_request("get", USERS_EP + "/" + user_id + "?" + select)
+            scim = EntraUserMapping.map_to_scim(_json_loads(response.content))
+            _ENTITY_CACHE.set(cache_key, scim)
+            return scim
     
     async def create_user(self, user_data: Dict[str, Any]):
         """
@@ -149,12 +326,12 @@ class EntraGraphService:
         if "passwordProfile" not in graph_user:
             graph_user["passwordProfile"] = {
                 "forceChangePasswordNextSignIn": True,
-                "password": "TemporaryP@ss" + str(hash(graph_user["userPrincipalName"]))[:8]
+                "password": _TEMP_PASSWORD_PREFIX + secrets.token_urlsafe(16)
             }
         
         # Make request to create user
-        response = await self._make_request("post", "/users", graph_user)
-        created_user = response.json()
+        response = await self._make_request("post", USERS_EP, graph_user)
+        created_user = _json_loads(response.content)
         
         return EntraUserMapping(created_user).to_scim_dict()
     
@@ -165,18 +342,28 @@ class EntraGraphService:
         # Convert SCIM user to Graph API format
         graph_user = EntraUserMapping.from_scim_dict(user_data)
         
-        # Make request to update user
-        response = await self._make_request("patch", f"/users/{user_id}", graph_user)
-        
+        _ENTITY_CACHE.invalidate((USERS_EP, user_id))
+
+        # Update and ask for the entity back in one round trip; fall back
+        # to a separate GET only when Graph replies with an empty 204
+        url = USERS_EP + "/" + user_id
+        response = await self._make_request(
+            "patch", url, graph_user,
+            extra_headers=_PREFER_REPRESENTATION
+        )
+        if response.status_code != 204 and response.content:
+            return EntraUserMapping(_json_loads(response.content)).to_scim_dict()
+
         # Get updated user
-        updated_user = await self._make_request("get", f"/users/{user_id}")
-        return EntraUserMapping(updated_user.json()).to_scim_dict()
+        updated_user = await self._make_request("get", url)
+        return EntraUserMapping(_json_loads(updated_user.content)).to_scim_dict()
     
     async def delete_user(self, user_id: str):
         """
         Delete a user in Microsoft Entra ID.
         """
-        await self._make_request("delete", f"/users/{user_id}")
+        _ENTITY_CACHE.invalidate((USERS_EP, user_id))
+        await self._make_request("delete", USERS_EP + "/" + user_id)
         return True
     
     # Group-related operations
@@ -189,12 +376,13 @@ class EntraGraphService:
         graph_filter = SCIMFilter.convert_to_graph_filter(filter_str) if filter_str else None
         
         # Make paginated request
-        result = await self._paginated_request("/groups", start_index, count, graph_filter)
+        result = await self._paginated_request(GROUPS_EP, start_index, count, graph_filter,
+                                               select_fields=EntraGroupMapping.GRAPH_SELECT_FIELDS)
         graph_groups = result["value"]
         total_count = result["totalCount"]
         
         # Convert to SCIM format
-        scim_groups = [EntraGroupMapping(group).to_scim_dict() for group in graph_groups]
+        scim_groups = EntraGroupMapping.bulk_to_scim(graph_groups)
         
         return {
             "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
@@ -208,10 +396,22 @@ class EntraGraphService:
         """
         Get a specific group from Microsoft Entra ID.
         """
-        response = await self._make_request("get", f"/groups/{group_id}")
-        graph_group = response.json()
-        
-        return EntraGroupMapping(graph_group).to_scim_dict()
+        cache_key = (GROUPS_EP, group_id)
+        cached = _ENTITY_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Per-key lock so concurrent misses fetch once
+        async with _ENTITY_CACHE.get_lock(cache_key):
+            cached = _ENTITY_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+
+            select = "$select=" + ",".join(EntraGroupMapping.GRAPH_SELECT_FIELDS)
+            response = await self._make_request("get", GROUPS_EP + "/" + group_id + "?" + select)
+            scim = EntraGroupMapping.map_to_scim(_json_loads(response.content))
+            _ENTITY_CACHE.set(cache_key, scim)
+            return scim
     
     async def create_group(self, group_data: Dict[str, Any]):
         """
@@ -235,8 +435,8 @@ class EntraGraphService:
             graph_group["mailEnabled"] = False
         
         # Make request to create group
-        response = await self._make_request("post", "/groups", graph_group)
-        created_group = response.json()
+        response = await self._make_request("post", GROUPS_EP, graph_group)
+        created_group = _json_loads(response.content)
         
         return EntraGroupMapping(created_group).to_scim_dict()
     
@@ -246,19 +446,29 @@ class EntraGraphService:
         """
         # Convert SCIM group to Graph API format
         graph_group = EntraGroupMapping.from_scim_dict(group_data)
-        
-        # Make request to update group
-        response = await self._make_request("patch", f"/groups/{group_id}", graph_group)
-        
+
+        _ENTITY_CACHE.invalidate((GROUPS_EP, group_id))
+
+        # Update and ask for the entity back in one round trip; fall back
+        # to a separate GET only when Graph replies with an empty 204
+        url = GROUPS_EP + "/" + group_id
+        response = await self._make_request(
+            "patch", url, graph_group,
+            extra_headers=_PREFER_REPRESENTATION
+        )
+        if response.status_code != 204 and response.content:
+            return EntraGroupMapping(_json_loads(response.content)).to_scim_dict()
+
         # Get updated group
-        updated_group = await self._make_request("get", f"/groups/{group_id}")
-        return EntraGroupMapping(updated_group.json()).to_scim_dict()
+        updated_group = await self._make_request("get", url)
+        return EntraGroupMapping(_json_loads(updated_group.content)).to_scim_dict()
     
     async def delete_group(self, group_id: str):
         """
         Delete a group in Microsoft Entra ID.
         """
-        await self._make_request("delete", f"/groups/{group_id}")
+        _ENTITY_CACHE.invalidate((GROUPS_EP, group_id))
+        await self._make_request("delete", GROUPS_EP + "/" + group_id)
         return True
     
     # Application-related operations
@@ -271,12 +481,13 @@ class EntraGraphService:
         graph_filter = SCIMFilter.convert_to_graph_filter(filter_str) if filter_str else None
         
         # Make paginated request
-        result = await self._paginated_request("/applications", start_index, count, graph_filter)
+        result = await self._paginated_request(APPLICATIONS_EP, start_index, count, graph_filter,
+                                               select_fields=EntraApplicationMapping.GRAPH_SELECT_FIELDS)
         graph_apps = result["value"]
         total_count = result["totalCount"]
         
         # Convert to SCIM format
-        scim_apps = [EntraApplicationMapping(app).to_scim_dict() for app in graph_apps]
+        scim_apps = EntraApplicationMapping.bulk_to_scim(graph_apps)
         
         return {
             "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
@@ -290,10 +501,22 @@ class EntraGraphService:
         """
         Get a specific application from Microsoft Entra ID.
         """
-        response = await self._make_request("get", f"/applications/{app_id}")
-        graph_app = response.json()
-        
-        return EntraApplicationMapping(graph_app).to_scim_dict()
+        cache_key = (APPLICATIONS_EP, app_id)
+        cached = _ENTITY_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Per-key lock so concurrent misses fetch once
+        async with _ENTITY_CACHE.get_lock(cache_key):
+            cached = _ENTITY_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+
+            select = "$select=" + ",".join(EntraApplicationMapping.GRAPH_SELECT_FIELDS)
+            response = await self._make_request("get", APPLICATIONS_EP + "/" + app_id + "?" + select)
+            scim = EntraApplicationMapping.map_to_scim(_json_loads(response.content))
+            _ENTITY_CACHE.set(cache_key, scim)
+            return scim
     
     async def create_application(self, app_data: Dict[str, Any]):
         """
@@ -310,8 +533,8 @@ class EntraGraphService:
             )
         
         # Make request to create application
-        response = await self._make_request("post", "/applications", graph_app)
-        created_app = response.json()
+        response = await self._make_request("post", APPLICATIONS_EP, graph_app)
+        created_app = _json_loads(response.content)
         
         return EntraApplicationMapping(created_app).to_scim_dict()
     
@@ -321,19 +544,29 @@ class EntraGraphService:
         """
         # Convert SCIM application to Graph API format
         graph_app = EntraApplicationMapping.from_scim_dict(app_data)
-        
-        # Make request to update application
-        response = await self._make_request("patch", f"/applications/{app_id}", graph_app)
-        
+
+        _ENTITY_CACHE.invalidate((APPLICATIONS_EP, app_id))
+
+        # Update and ask for the entity back in one round trip; fall back
+        # to a separate GET only when Graph replies with an empty 204
+        url = APPLICATIONS_EP + "/" + app_id
+        response = await self._make_request(
+            "patch", url, graph_app,
+            extra_headers=_PREFER_REPRESENTATION
+        )
+        if response.status_code != 204 and response.content:
+            return EntraApplicationMapping(_json_loads(response.content)).to_scim_dict()
+
         # Get updated application
-        updated_app = await self._make_request("get", f"/applications/{app_id}")
-        return EntraApplicationMapping(updated_app.json()).to_scim_dict()
+        updated_app = await self._make_request("get", APPLICATIONS_EP + "/" + app_id)
+        return EntraApplicationMapping(_json_loads(updated_app.content)).to_scim_dict()
     
     async def delete_application(self, app_id: str):
         """
         Delete an application in Microsoft Entra ID.
         """
-        await self._make_request("delete", f"/applications/{app_id}")
+        _ENTITY_CACHE.invalidate((APPLICATIONS_EP, app_id))
+        await self._make_request("delete", APPLICATIONS_EP + "/" + app_id)
         return True
     
     # Service Principal-related operations
@@ -346,12 +579,13 @@ class EntraGraphService:
         graph_filter = SCIMFilter.convert_to_graph_filter(filter_str) if filter_str else None
         
         # Make paginated request
-        result = await self._paginated_request("/servicePrincipals", start_index, count, graph_filter)
+        result = await self._paginated_request(SERVICE_PRINCIPALS_EP, start_index, count, graph_filter,
+                                               select_fields=EntraServicePrincipalMapping.GRAPH_SELECT_FIELDS)
         graph_sps = result["value"]
         total_count = result["totalCount"]
         
         # Convert to SCIM format
-        scim_sps = [EntraServicePrincipalMapping(sp).to_scim_dict() for sp in graph_sps]
+        scim_sps = EntraServicePrincipalMapping.bulk_to_scim(graph_sps)
         
         return {
             "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
@@ -365,10 +599,22 @@ class EntraGraphService:
         """
         Get a specific service principal from Microsoft Entra ID.
         """
-        response = await self._make_request("get", f"/servicePrincipals/{sp_id}")
-        graph_sp = response.json()
-        
-        return EntraServicePrincipalMapping(graph_sp).to_scim_dict()
+        cache_key = (SERVICE_PRINCIPALS_EP, sp_id)
+        cached = _ENTITY_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Per-key lock so concurrent misses fetch once
+        async with _ENTITY_CACHE.get_lock(cache_key):
+            cached = _ENTITY_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+
+            select = "$select=" + ",".join(EntraServicePrincipalMapping.GRAPH_SELECT_FIELDS)
+            response = await self._make_request("get", SERVICE_PRINCIPALS_EP + "/" + sp_id + "?" + select)
+            scim = EntraServicePrincipalMapping.map_to_scim(_json_loads(response.content))
+            _ENTITY_CACHE.set(cache_key, scim)
+            return scim
     
     async def create_service_principal(self, sp_data: Dict[str, Any]):
         """
@@ -385,8 +631,8 @@ class EntraGraphService:
             )
         
         # Make request to create service principal
-        response = await self._make_request("post", "/servicePrincipals", graph_sp)
-        created_sp = response.json()
+        response = await self._make_request("post", SERVICE_PRINCIPALS_EP, graph_sp)
+        created_sp = _json_loads(response.content)
         
         return EntraServicePrincipalMapping(created_sp).to_scim_dict()
     
@@ -396,17 +642,27 @@ class EntraGraphService:
         """
         # Convert SCIM service principal to Graph API format
         graph_sp = EntraServicePrincipalMapping.from_scim_dict(sp_data)
-        
-        # Make request to update service principal
-        response = await self._make_request("patch", f"/servicePrincipals/{sp_id}", graph_sp)
-        
+
+        _ENTITY_CACHE.invalidate((SERVICE_PRINCIPALS_EP, sp_id))
+
+        # Update and ask for the entity back in one round trip; fall back
+        # to a separate GET only when Graph replies with an empty 204
+        url = SERVICE_PRINCIPALS_EP + "/" + sp_id
+        response = await self._make_request(
+            "patch", url, graph_sp,
+            extra_headers=_PREFER_REPRESENTATION
+        )
+        if response.status_code != 204 and response.content:
+            return EntraServicePrincipalMapping(_json_loads(response.content)).to_scim_dict()
+
         # Get updated service principal
-        updated_sp = await self._make_request("get", f"/servicePrincipals/{sp_id}")
-        return EntraServicePrincipalMapping(updated_sp.json()).to_scim_dict()
+        updated_sp = await self._make_request("get", url)
+        return EntraServicePrincipalMapping(_json_loads(updated_sp.content)).to_scim_dict()
     
     async def delete_service_principal(self, sp_id: str):
         """
         Delete a service principal in Microsoft Entra ID.
         """
-        await self._make_request("delete", f"/servicePrincipals/{sp_id}")
+        _ENTITY_CACHE.invalidate((SERVICE_PRINCIPALS_EP, sp_id))
+        await self._make_request("delete", SERVICE_PRINCIPALS_EP + "/" + sp_id)
         return True
@@ -2,13 +2,144 @@
 Core SCIM service for interacting with Microsoft Entra ID through Graph API.
 """
 
+import asyncio
+import base64
+import hashlib
+import secrets
+
 import httpx
+import orjson
+from aiolimiter import AsyncLimiter
 from typing import Dict, List, Optional, Any
 from fastapi import HTTPException, status
 
 from scim_server.models.user import EntraUserMapping
 from scim_server.models.group import EntraGroupMapping
+from scim_server.utils.cache import TTLCache
 from scim_server.utils.filtering import SCIMFilter
+from scim_server.utils.streaming import parse_collection
+
+# Single-entity reads served from cache between writes; directory-sync
+# clients sweep the same ids repeatedly, so repeat reads within the TTL
+# skip the Graph round trip. Keys include a digest of the caller's
+# token so one caller is never served an entity another caller's token
+# fetched — each token's view stays subject to its own Graph
+# authorization. Entries hold (scim_dict, etag) so expired ones can be
+# revalidated with If-None-Match instead of refetched. Writes
+# invalidate their own id. Filtered list requests never touch this
+# cache.
+_ENTITY_CACHE = TTLCache(ttl=60, max_size=10_000)
+
+# Concurrency and rate caps shared by every request. The semaphore
+# keeps bursts inside the httpx pool instead of spilling into "pool is
+# full" waits, and the limiter stays under Graph's per-second budget so
+# we spend time doing work rather than backing off from 429s.
+_GRAPH_SEMAPHORE = asyncio.Semaphore(20)
+_GRAPH_LIMITER = AsyncLimiter(max_rate=130, time_period=1)
+
+# Throttled calls are retried with Retry-After or capped exponential
+# backoff before the 429 is surfaced to the caller
+_RETRY_MAX = 3
+_RETRY_BACKOFF_CAP = 8.0
+
+# Asks Graph to include the updated entity in the PATCH response so
+# update operations need no follow-up GET
+_PREFER_REPRESENTATION = {"Prefer": "return=representation"}
+
+# Graph requires this header for $count on directory objects
+_CONSISTENCY_EVENTUAL = {"ConsistencyLevel": "eventual"}
+
+# Prefix guarantees the generated temp password satisfies Graph's
+# complexity policy regardless of what token_urlsafe produces
+_TEMP_PASSWORD_PREFIX = "Tmp!"
+
+# Projection strings derived from the mapping field lists, joined once
+# at import; $select trims list payloads to just the mapped attributes
+_USER_SELECT = ",".join(EntraUserMapping.GRAPH_SELECT_FIELDS)
+_GROUP_SELECT = ",".join(EntraGroupMapping.GRAPH_SELECT_FIELDS)
+
+# Graph JSON batching accepts at most this many subrequests per call
+_BATCH_MAX = 20
+
+# Reused by every list response; frozen so callers cannot mutate it
+_LIST_RESPONSE_SCHEMAS = ("urn:ietf:params:scim:api:messages:2.0:ListResponse",)
+
+# Thin aliases so the JSON codec stays swappable in one place
+_json_loads = orjson.loads
+_json_dumps = orjson.dumps
+
+# Shared connection pool for Graph API calls. Reusing one client across
+# requests avoids a fresh TCP+TLS handshake per SCIM operation and lets
+# concurrent handlers multiplex over HTTP/2.
+_CLIENT = httpx.AsyncClient(
+    base_url="https://graph.microsoft.com/v1.0",
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    timeout=30
+)
+
+async def close_client():
+    """
+    Close the shared Graph API client. Called at application shutdown.
+    """
+    await _CLIENT.aclose()
+
+def _raise_for_graph(response: httpx.Response):
+    """
+    Raise an HTTPException for a failed Graph response.
+
+    The error body is decoded only when the Content-Type says it is
+    JSON, so HTML throttling pages skip the parse, and only decode
+    errors are caught rather than masking unrelated bugs.
+    """
+    if response.status_code < 400:
+        return
+
+    error_message = response.text or "Unknown error"
+    if response.headers.get("content-type", "").startswith("application/json"):
+        try:
+            error_message = _json_loads(response.content).get("error", {}).get("message", "Unknown error")
+        except orjson.JSONDecodeError:
+            pass
+
+    raise HTTPException(
+        status_code=response.status_code,
+        detail=f"Graph API error: {error_message}"
+    )
+
+def _encode_cursor(next_link: Optional[str]) -> Optional[str]:
+    """
+    Encode a Graph @odata.nextLink as an opaque base64url cursor.
+    """
+    if not next_link:
+        return None
+    return base64.urlsafe_b64encode(next_link.encode()).rstrip(b"=").decode()
+
+def _decode_cursor(cursor: str) -> str:
+    """
+    Decode an opaque cursor back to the Graph continuation URL.
+
+    Cursors come from untrusted callers and the decoded URL is fetched
+    with the caller's bearer token, so anything that is not a Graph
+    continuation URL is rejected. validate=True makes b64decode raise on
+    non-alphabet characters instead of silently discarding them.
+    """
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        next_link = base64.b64decode(cursor + padding, altchars=b"-_", validate=True).decode()
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+    if not next_link.startswith("https://graph.microsoft.com/"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+    return next_link
 
 class SCIMService:
     """
@@ -20,76 +151,137 @@ class SCIMService:
         Initialize with Microsoft Graph API access token.
         """
         self.access_token = access_token
-        self.headers = {"Authorization": f"Bearer {access_token}"}
-        self.graph_api_base = "https://graph.microsoft.com/v1.0"
+        # Entity cache keys are scoped by token digest, not the raw
+        # token, so cache keys never hold credential material
+        self._cache_scope = hashlib.blake2b(access_token.encode(), digest_size=16).digest()
+        # Pre-encoded httpx.Headers lets the client reuse the encoded
+        # header block on every call instead of re-encoding a plain dict
+        self.headers = httpx.Headers({
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        })
     
-    async def _make_request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None):
+    async def _make_request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None,
+                            params: Optional[Dict[str, Any]] = None,
+                            extra_headers: Optional[Dict[str, str]] = None):
         """
         Make a request to Microsoft Graph API.
         """
-        url = f"{self.graph_api_base}{endpoint}"
-        
-        async with httpx.AsyncClient() as client:
-            if method.lower() == "get":
-                response = await client.get(url, headers=self.headers)
-            elif method.lower() == "post":
-                response = await client.post(url, headers=self.headers, json=data)
-            elif method.lower() == "put" or method.lower() == "patch":
-                response = await client.patch(url, headers=self.headers, json=data)
-            elif method.lower() == "delete":
-                response = await client.delete(url, headers=self.headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-                
-            if response.status_code >= 400:
-                try:
-                    error_data = response.json()
-                    error_message = error_data.get("error", {}).get("message", "Unknown error")
-                except:
-                    error_message = response.text or "Unknown error"
-                    
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Graph API error: {error_message}"
+        # The client's base_url handles relative endpoints; absolute
+        # cursor continuation URLs from Graph pass through unchanged
+        url = endpoint
+
+        # orjson returns bytes, which httpx accepts natively as content
+        body = _json_dumps(data) if data is not None else None
+
+        if extra_headers:
+            headers = httpx.Headers(self.headers)
+            headers.update(extra_headers)
+        else:
+            headers = self.headers
+
+        for attempt in range(_RETRY_MAX + 1):
+            async with _GRAPH_LIMITER, _GRAPH_SEMAPHORE:
+                response = await _CLIENT.request(
+                    method.upper(), url, headers=headers, content=body, params=params
                 )
-                
-            return response
-    
+
+            if response.status_code != 429 or attempt == _RETRY_MAX:
+                break
+
+            # Honor Retry-After when Graph provides it, otherwise back
+            # off exponentially; either way the wait is capped
+            try:
+                delay = float(response.headers.get("Retry-After"))
+            except (TypeError, ValueError):
+                delay = float(2 ** attempt)
+            await asyncio.sleep(min(delay, _RETRY_BACKOFF_CAP))
+
+        _raise_for_graph(response)
+        return response
+
+    async def _stream_collection(self, endpoint: str,
+                                 params: Optional[Dict[str, Any]] = None,
+                                 extra_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        GET a collection endpoint and decode it incrementally.
+
+        List pages are parsed entity by entity through ijson instead of
+        materializing the whole response body before decoding, keeping
+        peak memory at one record.
+        """
+        if extra_headers:
+            headers = httpx.Headers(self.headers)
+            headers.update(extra_headers)
+        else:
+            headers = self.headers
+        async with _GRAPH_LIMITER, _GRAPH_SEMAPHORE, \
+                _CLIENT.stream("GET", endpoint, headers=headers, params=params) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                _raise_for_graph(response)
+
+            return await parse_collection(response.aiter_bytes())
+
+    async def _batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute up to 20 Graph operations in a single /$batch round trip.
+
+        Each entry follows the Graph JSON batching schema (id, method,
+        url, and optional body/headers/dependsOn). Responses are
+        returned in request order regardless of how Graph interleaved
+        them.
+        """
+        response = await self._make_request("post", "/$batch", {"requests": requests})
+        responses = _json_loads(response.content).get("responses", [])
+
+        order = {str(req["id"]): position for position, req in enumerate(requests)}
+        responses.sort(key=lambda item: order.get(str(item.get("id")), len(order)))
+        return responses
+
     # User-related operations
     
-    async def get_users(self, filter_str: Optional[str] = None, start_index: int = 1, count: int = 100):
+    async def get_users(self, filter_str: Optional[str] = None, start_index: int = 1, count: int = 100,
+                        cursor: Optional[str] = None):
         """
         Get users from Microsoft Entra ID.
         """
         # Convert SCIM filter to Graph API filter
         graph_filter = SCIMFilter.convert_to_graph_filter(filter_str)
-        filter_param = f"$filter={graph_filter}" if graph_filter else ""
-        
-        # Add pagination - only use $top for now (first page only)
-        if start_index != 1:
-            # For now, we'll return an error for pagination beyond the first page
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Pagination beyond the first page is not supported yet"
-            )
-        
-        pagination = f"$top={count}"
-        
-        # Build query string
-        query = f"?{filter_param}&{pagination}" if filter_param else f"?{pagination}"
-        
-        # Make request
-        response = await self._make_request("get", f"/users{query}")
-        graph_users = response.json().get("value", [])
-        
+
+        if cursor:
+            # Continue from the opaque cursor (Graph @odata.nextLink);
+            # each page is O(page size) regardless of position
+            result = await self._stream_collection(_decode_cursor(cursor))
+        else:
+            # Offset pagination beyond the first page is not supported;
+            # clients should follow nextCursor instead
+            if start_index != 1:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Pagination beyond the first page requires the cursor parameter"
+                )
+
+            # Build query parameters as a dict; httpx encodes the query
+            # string once instead of hand-joined f-strings
+            params = {"$top": count, "$count": "true", "$select": _USER_SELECT}
+            if graph_filter:
+                params["$filter"] = graph_filter
+
+            result = await self._stream_collection("/users", params=params,
+                                                   extra_headers=_CONSISTENCY_EVENTUAL)
+
+        graph_users = result.get("value", [])
+
         # Convert to SCIM format
-        scim_users = [EntraUserMapping(user).to_scim_dict() for user in graph_users]
-        
+        scim_users = EntraUserMapping.bulk_to_scim(graph_users)
+
         return {
-            "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
-            "totalResults": len(scim_users),
+            "schemas": _LIST_RESPONSE_SCHEMAS,
+            "totalResults": result.get("@odata.count", len(scim_users)),
             "startIndex": start_index,
             "itemsPerPage": count,
+            "nextCursor": _encode_cursor(result.get("@odata.nextLink")),
             "Resources": scim_users
         }
     
@@ -97,10 +289,33 @@ class SCIMService:
         """
         Get a specific user from Microsoft Entra ID.
         """
-        response = await self._make_request("get", f"/users/{user_id}")
-        graph_user = response.json()
-        
-        return EntraUserMapping(graph_user).to_scim_dict()
+        cache_key = ("/users", user_id, self._cache_scope)
+        cached = _ENTITY_CACHE.get(cache_key)
+        if cached is not None:
+            return cached[0]
+
+        # Per-key lock so concurrent misses fetch once
+        async with _ENTITY_CACHE.get_lock(cache_key):
+            cached = _ENTITY_CACHE.get(cache_key)
+            if cached is not None:
+                return cached[0]
+
+            # Revalidate an expired entry with If-None-Match when we
+            # still hold its etag; a 304 carries no body at all
+            stale = _ENTITY_CACHE.get_stale(cache_key)
+            conditional = {"If-None-Match": stale[1]} if stale and stale[1] else None
+
+            response = await self._make_request("get", f"/users/{user_id}",
+                                                extra_headers=conditional)
+            if response.status_code == 304 and stale is not None:
+                _ENTITY_CACHE.set(cache_key, stale)
+                return stale[0]
+
+            graph_user = _json_loads(response.content)
+            scim = EntraUserMapping(graph_user).to_scim_dict()
+            etag = response.headers.get("ETag") or graph_user.get("@odata.etag")
+            _ENTITY_CACHE.set(cache_key, (scim, etag))
+            return scim
     
     async def create_user(self, user_data: Dict[str, Any]):
         """
@@ -120,12 +335,12 @@ class SCIMService:
         if "passwordProfile" not in graph_user:
             graph_user["passwordProfile"] = {
                 "forceChangePasswordNextSignIn": True,
-                "password": "TemporaryP@ss" + str(hash(graph_user["userPrincipalName"]))[:8]
+                "password": _TEMP_PASSWORD_PREFIX + secrets.token_urlsafe(16)
             }
         
         # Make request to create user
         response = await self._make_request("post", "/users", graph_user)
-        created_user = response.json()
+        created_user = _json_loads(response.content)
         
         return EntraUserMapping(created_user).to_scim_dict()
     
@@ -135,56 +350,105 @@ class SCIMService:
         """
         # Convert SCIM user to Graph API format
         graph_user = EntraUserMapping.from_scim_dict(user_data)
-        
-        # Make request to update user
-        response = await self._make_request("patch", f"/users/{user_id}", graph_user)
-        
-        # Get updated user
-        updated_user = await self._make_request("get", f"/users/{user_id}")
-        return EntraUserMapping(updated_user.json()).to_scim_dict()
+
+        _ENTITY_CACHE.invalidate(("/users", user_id, self._cache_scope))
+
+        # Fuse the PATCH and the follow-up GET into one $batch round
+        # trip; dependsOn sequences the read after the write
+        url = f"/users/{user_id}"
+        patched, fetched = await self._batch([
+            {"id": "1", "method": "PATCH", "url": url, "body": graph_user,
+             "headers": {"Content-Type": "application/json"}},
+            {"id": "2", "method": "GET", "url": url, "dependsOn": ["1"]}
+        ])
+
+        for sub in (patched, fetched):
+            if sub.get("status", 500) >= 400:
+                error = (sub.get("body") or {}).get("error", {})
+                raise HTTPException(
+                    status_code=sub.get("status", 500),
+                    detail=f"Graph API error: {error.get('message', 'Unknown error')}"
+                )
+
+        return EntraUserMapping(fetched.get("body", {})).to_scim_dict()
+
+    async def bulk_get_users(self, user_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch many users by id through concurrent $batch calls.
+
+        Ids are packed 20 per batch (the Graph limit) and the batches
+        are issued concurrently, so N lookups cost ceil(N / 20) round
+        trips instead of N. Users that no longer exist are skipped.
+        """
+        chunks = [user_ids[i:i + _BATCH_MAX] for i in range(0, len(user_ids), _BATCH_MAX)]
+
+        batches = await asyncio.gather(*[
+            self._batch([
+                {"id": str(position), "method": "GET", "url": f"/users/{user_id}"}
+                for position, user_id in enumerate(chunk)
+            ])
+            for chunk in chunks
+        ])
+
+        graph_users = [
+            sub["body"]
+            for responses in batches
+            for sub in responses
+            if sub.get("status", 500) < 400 and sub.get("body")
+        ]
+        return EntraUserMapping.bulk_to_scim(graph_users)
     
     async def delete_user(self, user_id: str):
         """
         Delete a user in Microsoft Entra ID.
         """
+        _ENTITY_CACHE.invalidate(("/users", user_id, self._cache_scope))
         await self._make_request("delete", f"/users/{user_id}")
         return True
     
     # Group-related operations
     
-    async def get_groups(self, filter_str: Optional[str] = None, start_index: int = 1, count: int = 100):
+    async def get_groups(self, filter_str: Optional[str] = None, start_index: int = 1, count: int = 100,
+                         cursor: Optional[str] = None):
         """
         Get groups from Microsoft Entra ID.
         """
         # Convert SCIM filter to Graph API filter
         graph_filter = SCIMFilter.convert_to_graph_filter(filter_str)
-        filter_param = f"$filter={graph_filter}" if graph_filter else ""
-        
-        # Add pagination - only use $top for now (first page only)
-        if start_index != 1:
-            # For now, we'll return an error for pagination beyond the first page
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Pagination beyond the first page is not supported yet"
-            )
-        
-        pagination = f"$top={count}"
-        
-        # Build query string
-        query = f"?{filter_param}&{pagination}" if filter_param else f"?{pagination}"
-        
-        # Make request
-        response = await self._make_request("get", f"/groups{query}")
-        graph_groups = response.json().get("value", [])
-        
+
+        if cursor:
+            # Continue from the opaque cursor (Graph @odata.nextLink);
+            # each page is O(page size) regardless of position
+            result = await self._stream_collection(_decode_cursor(cursor))
+        else:
+            # Offset pagination beyond the first page is not supported;
+            # clients should follow nextCursor instead
+            if start_index != 1:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Pagination beyond the first page requires the cursor parameter"
+                )
+
+            # Build query parameters as a dict; httpx encodes the query
+            # string once instead of hand-joined f-strings
+            params = {"$top": count, "$count": "true", "$select": _GROUP_SELECT}
+            if graph_filter:
+                params["$filter"] = graph_filter
+
+            result = await self._stream_collection("/groups", params=params,
+                                                   extra_headers=_CONSISTENCY_EVENTUAL)
+
+        graph_groups = result.get("value", [])
+
         # Convert to SCIM format
-        scim_groups = [EntraGroupMapping(group).to_scim_dict() for group in graph_groups]
-        
+        scim_groups = EntraGroupMapping.bulk_to_scim(graph_groups)
+
         return {
-            "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
-            "totalResults": len(scim_groups),
+            "schemas": _LIST_RESPONSE_SCHEMAS,
+            "totalResults": result.get("@odata.count", len(scim_groups)),
             "startIndex": start_index,
             "itemsPerPage": count,
+            "nextCursor": _encode_cursor(result.get("@odata.nextLink")),
             "Resources": scim_groups
         }
     
@@ -192,10 +456,33 @@ class SCIMService:
         """
         Get a specific group from Microsoft Entra ID.
         """
-        response = await self._make_request("get", f"/groups/{group_id}")
-        graph_group = response.json()
-        
-        return EntraGroupMapping(graph_group).to_scim_dict()
+        cache_key = ("/groups", group_id, self._cache_scope)
+        cached = _ENTITY_CACHE.get(cache_key)
+        if cached is not None:
+            return cached[0]
+
+        # Per-key lock so concurrent misses fetch once
+        async with _ENTITY_CACHE.get_lock(cache_key):
+            cached = _ENTITY_CACHE.get(cache_key)
+            if cached is not None:
+                return cached[0]
+
+            # Revalidate an expired entry with If-None-Match when we
+            # still hold its etag; a 304 carries no body at all
+            stale = _ENTITY_CACHE.get_stale(cache_key)
+            conditional = {"If-None-Match": stale[1]} if stale and stale[1] else None
+
+            response = await self._make_request("get", f"/groups/{group_id}",
+                                                extra_headers=conditional)
+            if response.status_code == 304 and stale is not None:
+                _ENTITY_CACHE.set(cache_key, stale)
+                return stale[0]
+
+            graph_group = _json_loads(response.content)
+            scim = EntraGroupMapping(graph_group).to_scim_dict()
+            etag = response.headers.get("ETag") or graph_group.get("@odata.etag")
+            _ENTITY_CACHE.set(cache_key, (scim, etag))
+            return scim
     
     async def create_group(self, group_data: Dict[str, Any]):
         """
@@ -220,7 +507,7 @@ class SCIMService:
         
         # Make request to create group
         response = await self._make_request("post", "/groups", graph_group)
-        created_group = response.json()
+        created_group = _json_loads(response.content)
         
         return EntraGroupMapping(created_group).to_scim_dict()
     
@@ -230,17 +517,26 @@ class SCIMService:
         """
         # Convert SCIM group to Graph API format
         graph_group = EntraGroupMapping.from_scim_dict(group_data)
-        
-        # Make request to update group
-        response = await self._make_request("patch", f"/groups/{group_id}", graph_group)
-        
+
+        _ENTITY_CACHE.invalidate(("/groups", group_id, self._cache_scope))
+
+        # Update and ask for the entity back in one round trip; fall back
+        # to a separate GET only when Graph replies with an empty 204
+        response = await self._make_request(
+            "patch", f"/groups/{group_id}", graph_group,
+            extra_headers=_PREFER_REPRESENTATION
+        )
+        if response.status_code != 204 and response.content:
+            return EntraGroupMapping(_json_loads(response.content)).to_scim_dict()
+
         # Get updated group
         updated_group = await self._make_request("get", f"/groups/{group_id}")
-        return EntraGroupMapping(updated_group.json()).to_scim_dict()
+        return EntraGroupMapping(_json_loads(updated_group.content)).to_scim_dict()
     
     async def delete_group(self, group_id: str):
         """
         Delete a group in Microsoft Entra ID.
         """
+        _ENTITY_CACHE.invalidate(("/groups", group_id, self._cache_scope))
         await self._make_request("delete", f"/groups/{group_id}")
         return True
@@ -1,4 +1,6 @@
 from scim_server.utils.auth import EntraAuth
+from scim_server.utils.cache import TTLCache
 from scim_server.utils.filtering import SCIMFilter
+from scim_server.utils.orjson_response import ORJSONResponse
 
-__all__ = ['EntraAuth', 'SCIMFilter']
+__all__ = ['EntraAuth', 'SCIMFilter', 'ORJSONResponse', 'TTLCache']
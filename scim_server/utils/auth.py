@@ -2,14 +2,84 @@
 Authentication utilities for integrating with Microsoft Entra ID.
 """
 
+import asyncio
+import functools
+import hashlib
+import time
+
 import msal
 import jwt
 import httpx
 from fastapi import Depends, HTTPException, Request, status
 from jose import JWTError, jwt
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 
 from scim_server.config import settings
+from scim_server.utils.cache import TTLCache
+
+# Shared client for Graph calls made during authentication. Keeping one
+# pooled client avoids a fresh TLS handshake on every login and lets
+# concurrent callbacks multiplex over HTTP/2.
+_graph_client = httpx.AsyncClient(
+    base_url="https://graph.microsoft.com",
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    timeout=10.0
+)
+
+async def close_graph_client():
+    """
+    Close the shared auth Graph client. Called at application shutdown.
+    """
+    await _graph_client.aclose()
+
+# Signing keyset from the authority's JWKS endpoint, refetched at most
+# hourly; one GET amortizes over every validation in between
+_JWKS_CACHE = TTLCache(ttl=3600, max_size=4)
+_JWKS_KEY = "jwks"
+
+async def _get_jwks() -> Dict:
+    """
+    Return the authority's JSON Web Key Set, cached for an hour.
+    """
+    cached = _JWKS_CACHE.get(_JWKS_KEY)
+    if cached is not None:
+        return cached
+
+    async with _JWKS_CACHE.get_lock(_JWKS_KEY):
+        cached = _JWKS_CACHE.get(_JWKS_KEY)
+        if cached is not None:
+            return cached
+
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.get(f"{settings.AUTHORITY}/discovery/v2.0/keys")
+        response.raise_for_status()
+        jwks = response.json()
+        _JWKS_CACHE.set(_JWKS_KEY, jwks)
+        return jwks
+
+# In-process cache of validated token payloads, keyed by a token digest.
+# TTL is capped at 5 minutes or the token's own exp, whichever is sooner.
+_TOKEN_CACHE: Dict[bytes, Tuple[float, Dict]] = {}
+_TOKEN_CACHE_TTL = 300
+_TOKEN_CACHE_MAX = 1024
+
+@functools.lru_cache(maxsize=1)
+def _msal_app() -> msal.ConfidentialClientApplication:
+    """
+    Lazily build the one MSAL confidential client for the process.
+
+    Constructing ConfidentialClientApplication re-runs authority
+    metadata discovery and starts with an empty token cache, so it is
+    built once and reused. The attached in-memory token cache lets MSAL
+    serve repeat client-credential acquisitions silently.
+    """
+    return msal.ConfidentialClientApplication(
+        settings.CLIENT_ID,
+        authority=settings.AUTHORITY,
+        client_credential=settings.CLIENT_SECRET,
+        token_cache=msal.SerializableTokenCache()
+    )
 
 class EntraAuth:
     """
@@ -19,13 +89,9 @@ class EntraAuth:
     @staticmethod
     def get_msal_app():
         """
-        Get Microsoft Authentication Library (MSAL) confidential client application.
+        Get the shared Microsoft Authentication Library (MSAL) confidential client application.
         """
-        return msal.ConfidentialClientApplication(
-            settings.CLIENT_ID,
-            authority=settings.AUTHORITY,
-            client_credential=settings.CLIENT_SECRET
-        )
+        return _msal_app()
     
     @staticmethod
     def get_auth_url(redirect_uri: str = None, scopes: List[str] = None):
@@ -53,7 +119,11 @@ class EntraAuth:
             scopes = settings.SCOPE
             
         msal_app = EntraAuth.get_msal_app()
-        result = msal_app.acquire_token_by_authorization_code(code, scopes, redirect_uri=redirect_uri)
+        # MSAL's code exchange does blocking OIDC HTTP calls; run it on a
+        # worker thread so the event loop keeps serving other requests
+        result = await asyncio.to_thread(
+            msal_app.acquire_token_by_authorization_code, code, scopes, redirect_uri=redirect_uri
+        )
         
         if "error" in result:
             raise HTTPException(
@@ -64,42 +134,91 @@ class EntraAuth:
             
         return result
     
+    @staticmethod
+    async def warm_graph_connection():
+        """
+        Best-effort warm-up of the shared Graph connection. Establishes
+        DNS/TCP/TLS ahead of the first real call; failures are ignored
+        because the subsequent request will surface any real problem.
+        """
+        try:
+            await _graph_client.head("/v1.0/$metadata")
+        except httpx.HTTPError:
+            pass
+
     @staticmethod
     async def get_user_info(token: str):
         """
         Get user information from Microsoft Graph API.
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://graph.microsoft.com/v1.0/me",
-                headers={"Authorization": f"Bearer {token}"}
+        response = await _graph_client.get(
+            "/v1.0/me",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Failed to get user info",
+                headers={"WWW-Authenticate": "Bearer"}
             )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Failed to get user info",
-                    headers={"WWW-Authenticate": "Bearer"}
-                )
-                
-            return response.json()
+
+        return response.json()
     
     @staticmethod
     async def validate_token(token: str):
         """
         Validate access token from Microsoft Entra ID.
+
+        The signature is verified against the authority's cached JWKS
+        keyset, so the steady-state cost is one RSA verify per new
+        token. Validation results are cached so repeat requests carrying
+        the same bearer token skip the decode entirely.
         """
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        cached = _TOKEN_CACHE.get(key)
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
+
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except JWTError:
+            _TOKEN_CACHE.pop(key, None)
+            return None
+
+        jwks = await _get_jwks()
+        signing_key = next((k for k in jwks.get("keys", []) if k.get("kid") == kid), None)
+        if signing_key is None:
+            # The authority may have rotated keys since the cached fetch
+            _JWKS_CACHE.invalidate(_JWKS_KEY)
+            jwks = await _get_jwks()
+            signing_key = next((k for k in jwks.get("keys", []) if k.get("kid") == kid), None)
+            if signing_key is None:
+                return None
+
         try:
-            # For proper validation, you should use Microsoft's JWKS endpoint
-            # This is a simplified version
             payload = jwt.decode(
                 token,
-                options={"verify_signature": False},  # In production, you should verify the signature
-                audience=settings.CLIENT_ID
+                signing_key,
+                algorithms=["RS256"],
+                audience=settings.CLIENT_ID,
+                issuer=f"{settings.AUTHORITY}/v2.0"
             )
-            return payload
         except JWTError:
+            # Invalidate any stale entry for a token that stopped validating
+            _TOKEN_CACHE.pop(key, None)
             return None
+
+        ttl = _TOKEN_CACHE_TTL
+        exp = payload.get("exp")
+        if exp is not None:
+            ttl = min(ttl, max(exp - time.time(), 0))
+
+        if len(_TOKEN_CACHE) >= _TOKEN_CACHE_MAX:
+            _TOKEN_CACHE.clear()
+        _TOKEN_CACHE[key] = (time.monotonic() + ttl, payload)
+
+        return payload
     
     @staticmethod
     async def get_current_user(request: Request):
@@ -0,0 +1,67 @@
+"""
+Small in-process TTL cache for the service layer.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """
+    Bounded TTL cache for async callers.
+
+    Entries expire after ttl seconds and the whole cache resets when it
+    grows past max_size. get_lock hands out a per-key asyncio.Lock so
+    concurrent misses for the same key can serialize their population
+    instead of stampeding the backend.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 2048):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+
+    def get(self, key: Hashable):
+        """
+        Return the cached value for key, or None if absent or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() >= entry[0]:
+            return None
+        return entry[1]
+
+    def get_stale(self, key: Hashable):
+        """
+        Return the value for key even when expired, or None if absent.
+
+        Expired entries are kept around (bounded by max_size) so callers
+        can revalidate them cheaply instead of refetching from scratch.
+        """
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None else None
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Store a value under key for the configured TTL.
+        """
+        if len(self._entries) >= self.max_size:
+            self._entries.clear()
+            self._locks.clear()
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: Hashable):
+        """
+        Drop the entry for key, if present.
+        """
+        self._entries.pop(key, None)
+
+    def get_lock(self, key: Hashable) -> asyncio.Lock:
+        """
+        Return the lock guarding population of key, creating it on demand.
+        """
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks.setdefault(key, asyncio.Lock())
+        return lock
@@ -2,9 +2,22 @@
 Utilities for handling SCIM filtering operations.
 """
 
+import functools
 import re
 from typing import Optional, Dict, Any, List, Union
 
+from fastapi import HTTPException, status
+
+# Compiled once at import; the translator runs on every filtered list
+# request and re-compiling the pattern per call is pure overhead.
+# Anchored via fullmatch so trailing garbage is rejected instead of
+# silently ignored; the value is a quoted string, a bare token, or
+# absent entirely for the value-less 'pr' (present) operator.
+_SIMPLE_FILTER_RE = re.compile(r'(\S+)\s+(\S+)(?:\s+(?:"([^"]*)"|(\S+)))?')
+
+# Literal boolean values pass through to Graph lowercased, unquoted
+_BOOL_VALUES = frozenset(("true", "false"))
+
 class SCIMFilter:
     """
     Utility class for parsing and converting SCIM filters to Microsoft Graph API filters.
@@ -33,70 +46,92 @@ class SCIMFilter:
         'emails.value': 'mail',
         'active': 'accountEnabled',
         'id': 'id',
-        'externalId': 'userPrincipalName',
-        
-        # Group mappings
-        'displayName': 'displayName'
+        'externalId': 'userPrincipalName'
     }
     
     @staticmethod
     def parse_simple_filter(filter_str: str) -> Optional[Dict[str, Any]]:
         """
         Parse a simple SCIM filter string (e.g., 'userName eq "john@example.com"')
-        Returns a dictionary with attribute, operator, and value.
+        Returns a dictionary with attribute, operator, and value; the
+        value is None for value-less filters such as 'title pr'.
         """
-        # Regex for SCIM filter format
-        pattern = r'(\S+)\s+(\S+)\s+"?([^"]*)"?'
-        match = re.match(pattern, filter_str)
-        
+        match = _SIMPLE_FILTER_RE.fullmatch(filter_str.strip())
+
         if not match:
             return None
-            
-        attribute, operator, value = match.groups()
-        
+
+        attribute, operator, quoted, bare = match.groups()
+
         return {
             'attribute': attribute,
             'operator': operator,
-            'value': value
+            'value': quoted if quoted is not None else bare
         }
     
     @staticmethod
     def convert_to_graph_filter(scim_filter: Optional[str]) -> str:
         """
         Convert a SCIM filter string to a Microsoft Graph API filter string.
+
+        The empty case — every unfiltered list call — returns before any
+        cache machinery runs; non-empty filters go through the memoized
+        translator, so a repeat filter costs one dict probe instead of a
+        reparse.
         """
-        if not scim_filter:
-            return ""
-            
-        # For now, we'll just handle simple filters
-        parsed = SCIMFilter.parse_simple_filter(scim_filter)
-        if not parsed:
-            return ""
-            
-        attribute = parsed['attribute']
-        operator = parsed['operator']
-        value = parsed['value']
-        
-        # Map SCIM attribute to Graph API attribute
-        graph_attribute = SCIMFilter.attribute_mapping.get(attribute, attribute)
-        
-        # Map SCIM operator to Graph API operator
-        graph_operator = SCIMFilter.operators.get(operator)
-        
-        if not graph_operator:
-            return ""
-            
-        # Special handling for 'pr' (present) operator
-        if operator == 'pr':
-            return f"{graph_attribute} ne null"
-            
-        # Handle Boolean values
-        if value.lower() in ('true', 'false'):
-            return f"{graph_attribute} {graph_operator} {value.lower()}"
-            
-        # Handle numeric values
-        if value.isdigit():
-            return f"{graph_attribute} {graph_operator} {value}"
-            
-        # Handle string values (needs single quotes in Graph API)
-        return f"{graph_attribute} {graph_operator} '{value}'"
+        return _convert_cached(scim_filter) if scim_filter else ""
+
+@functools.lru_cache(maxsize=2048)
+def _convert_cached(scim_filter: str) -> str:
+    """
+    Translate a non-empty SCIM filter, memoizing the pure result.
+    """
+    # For now, we'll just handle simple filters. A filter we cannot
+    # parse is rejected outright: silently returning "" would turn a
+    # malformed filter into an unfiltered full-directory scan.
+    parsed = SCIMFilter.parse_simple_filter(scim_filter)
+    if not parsed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported SCIM filter: {scim_filter}"
+        )
+
+    attribute = parsed['attribute']
+    operator = parsed['operator']
+    value = parsed['value']
+
+    # Map SCIM attribute to Graph API attribute
+    graph_attribute = SCIMFilter.attribute_mapping.get(attribute, attribute)
+
+    # Map SCIM operator to Graph API operator
+    graph_operator = SCIMFilter.operators.get(operator)
+
+    if not graph_operator:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported SCIM filter operator: {operator}"
+        )
+
+    # Special handling for 'pr' (present) operator, which takes no value
+    if operator == 'pr':
+        if value is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported SCIM filter: {scim_filter}"
+            )
+        return f"{graph_attribute} ne null"
+
+    if value is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported SCIM filter: {scim_filter}"
+        )
+
+    # Booleans and numbers pass through bare; strings need single
+    # quotes in Graph API
+    lowered = value.lower()
+    if lowered in _BOOL_VALUES:
+        return f"{graph_attribute} {graph_operator} {lowered}"
+    if value.isdigit():
+        return f"{graph_attribute} {graph_operator} {value}"
+    return f"{graph_attribute} {graph_operator} '{value}'"
@@ -0,0 +1,52 @@
+"""
+Streaming helpers for decoding large Graph API collection responses.
+"""
+
+from typing import Any, AsyncIterable, Dict
+
+import ijson
+from ijson.common import ObjectBuilder
+
+
+@ijson.coroutine
+def _collect(items: list, meta: Dict[str, Any]):
+    """
+    Push-mode consumer of ijson parse events.
+
+    Entities inside the top-level "value" array are assembled one at a
+    time and appended to items; top-level scalars such as @odata.count
+    and @odata.nextLink land in meta.
+    """
+    builder = None
+    while True:
+        prefix, event, value = (yield)
+        if prefix.startswith("value.item"):
+            if prefix == "value.item" and event == "start_map":
+                builder = ObjectBuilder()
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == "value.item" and event == "end_map":
+                    items.append(builder.value)
+                    builder = None
+        elif prefix and event in ("string", "number", "boolean", "null"):
+            meta[prefix] = value
+
+
+async def parse_collection(chunks: AsyncIterable[bytes]) -> Dict[str, Any]:
+    """
+    Incrementally parse a Graph collection response from a byte stream.
+
+    Only one entity is materialized at a time, so peak memory stays
+    O(one record) instead of O(whole page). Returns a dict shaped like
+    the fully-decoded response: the "value" list plus any top-level
+    scalar fields (@odata.count, @odata.nextLink, ...).
+    """
+    items: list = []
+    meta: Dict[str, Any] = {}
+    target = ijson.parse_coro(_collect(items, meta), use_float=True)
+    async for chunk in chunks:
+        target.send(chunk)
+    target.close()
+
+    meta["value"] = items
+    return meta